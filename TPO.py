@@ -1,41 +1,30 @@
 #!/usr/bin/env python3
+import os
 import sys
+import tempfile
 import time
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy se usa la versión en Python puro de Floyd-Warshall
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # sin numba se usa la versión vectorizada con NumPy
+    njit = None
 
 # ------------------------------------------------------------
 # FUNCIONES DE LECTURA Y PREPARACIÓN DE DATOS
 # ------------------------------------------------------------
 
-#Elimina comentarios y espacios sobrantes dividiendo por //, dejando solo el contenido útil.
+#Elimina comentarios y espacios sobrantes cortando en el primer //, dejando solo el contenido útil.
 def eliminar_comentario(linea: str) -> str:
-    return linea.split("//")[0].strip()
-
-#Lee una sección del archivo con una cantidad conocida de líneas.
-def leer_seccion(lineas, inicio, cantidad, parser):
-    datos = []
-    leidos = 0
-    for i in range(inicio, len(lineas)):
-        if leidos >= cantidad:
-            break
-        linea = eliminar_comentario(lineas[i])
-        if not linea:
-            continue
-        try:
-            datos.append(parser(linea))
-            leidos += 1
-        except Exception:
-            print(f"Advertencia: no se pudo leer la línea -> {linea}")
-    return datos
+    return linea.partition("//")[0].strip()
 
 #Lee el archivo del caso y devuelve todos los datos en un diccionario estructurado para trabajarlo mas tarde.
 def leer_datos(nombre_archivo: str) -> dict:
-    try:
-        with open(nombre_archivo, 'r') as f:
-            lineas = f.readlines()
-    except FileNotFoundError:
-        print(f"Error: No se encontró el archivo '{nombre_archivo}'")
-        return None
-
     datos = {
         'configuracion': {},
         'nodos': {},
@@ -44,89 +33,108 @@ def leer_datos(nombre_archivo: str) -> dict:
         'aristas': {}
     }
 
-    #Detecta cada parte del archivo casos y lo guarda en su respectivo diccionario.
-    for linea in lineas:
-        linea = eliminar_comentario(linea)
-        if not linea:
-            continue
-        partes = linea.split()
-        if len(partes) < 2:
-            continue
-        if partes[0] == "NODOS":
-            datos['configuracion']['num_nodos'] = int(partes[1])
-        elif partes[0] == "HUBS":
-            datos['configuracion']['num_hubs'] = int(partes[1])
-        elif partes[0] == "PAQUETES":
-            datos['configuracion']['num_paquetes'] = int(partes[1])
-        elif partes[0] == "CAPACIDAD_CAMION":
-            datos['configuracion']['capacidad_camion'] = int(partes[1])
-        elif partes[0] == "DEPOSITO_ID":
-            datos['configuracion']['deposito_id'] = int(partes[1])
-            break  # termina la lectura de configuración
-
-    #Detecta el inicio de una parte de la configuracion, tiene que tener la forma ---XXXXX---
-    secciones = {}
-    for i, linea in enumerate(lineas):
-        if "---" in linea:
-            partes = linea.split("---")
-            if len(partes) > 1:
-                nombre = partes[1].strip().split()[0].upper()
-                secciones[nombre] = i + 1
-
     #Guarda la info de manera conveniente, EJ: nodo 5 5, {'x': 10, 'y': 20}
+    #Cada línea se divide una sola vez y solo hasta los campos que se usan; el resto de la línea se descarta.
     def parsear_nodo(linea):
-        partes = linea.split()
-        id_nodo = int(partes[0])
-        x = int(partes[1])
-        y = int(partes[2])
-        return id_nodo, {'x': x, 'y': y}
+        id_nodo, x, y = linea.split(None, 3)[:3]
+        return int(id_nodo), {'x': int(x), 'y': int(y)}
 
     def parsear_hub(linea):
-        partes = linea.split()
-        id_hub = int(partes[0])
-        costo = float(partes[1])
-        return id_hub, costo
+        id_hub, costo = linea.split(None, 2)[:2]
+        return int(id_hub), float(costo)
 
     def parsear_paquete(linea):
-        partes = linea.split()
-        id_paquete = int(partes[0])
-        origen = int(partes[1])
-        destino = int(partes[2])
-        return id_paquete, {'origen': origen, 'destino': destino}
+        id_paquete, origen, destino = linea.split(None, 3)[:3]
+        return int(id_paquete), {'origen': int(origen), 'destino': int(destino)}
 
     def parsear_arista(linea):
-        partes = linea.split()
-        nodo1 = int(partes[0])
-        nodo2 = int(partes[1])
-        peso = float(partes[2])
-        return (nodo1, nodo2), peso
-
-    #Lee los nodos
-    if "NODOS" in secciones:
-        nodos_list = leer_seccion(lineas, secciones["NODOS"], datos['configuracion']['num_nodos'], parsear_nodo)
-        for id_nodo, props in nodos_list:
-            datos['nodos'][id_nodo] = props
-
-    #Lee los hubs
-    if "HUBS" in secciones:
-        hubs_list = leer_seccion(lineas, secciones["HUBS"], datos['configuracion']['num_hubs'], parsear_hub)
-        for id_hub, costo in hubs_list:
-            datos['hubs'][id_hub] = costo
-
-    #Lee los paquetes
-    if "PAQUETES" in secciones:
-        paquetes_list = leer_seccion(lineas, secciones["PAQUETES"], datos['configuracion']['num_paquetes'], parsear_paquete)
-        for id_paq, props in paquetes_list:
-            datos['paquetes'][id_paq] = props
-
-    #Lee las aristas
-    if "ARISTAS" in secciones:
-        aristas_list = leer_seccion(lineas, secciones["ARISTAS"], float('inf'), parsear_arista)
-        for edge, peso in aristas_list:
-            datos['aristas'][edge] = peso
-            # grafo no dirigido
-            if (edge[1], edge[0]) not in datos['aristas']:
-                datos['aristas'][(edge[1], edge[0])] = peso
+        nodo1, nodo2, peso = linea.split(None, 3)[:3]
+        return (int(nodo1), int(nodo2)), float(peso)
+
+    # grafo no dirigido: cada arista se guarda una sola vez como (menor, mayor), floyd_warshall carga los dos
+    # sentidos en la matriz. Si un par se repite, una línea posterior solo reemplaza el peso cuando lista el par
+    # en el sentido contrario al de su primera aparición (un lazo u u siempre lo reemplaza); si no, se mantiene
+    # el peso anterior. Es el mismo resultado que daba guardar los dos sentidos por separado.
+    primer_sentido = {}
+
+    def guardar_arista(extremos, peso):
+        nodo1, nodo2 = extremos
+        clave = (min(nodo1, nodo2), max(nodo1, nodo2))
+        if clave not in primer_sentido:
+            primer_sentido[clave] = extremos
+        elif (nodo2, nodo1) != primer_sentido[clave]:
+            return
+        datos['aristas'][clave] = peso
+
+    #Para cada sección: dónde se guarda, cómo se lee cada línea y qué clave de la configuración dice cuántas líneas
+    #tiene (las aristas se leen hasta el final del archivo)
+    secciones = {
+        'NODOS': ('nodos', parsear_nodo, 'num_nodos'),
+        'HUBS': ('hubs', parsear_hub, 'num_hubs'),
+        'PAQUETES': ('paquetes', parsear_paquete, 'num_paquetes'),
+        'ARISTAS': ('aristas', parsear_arista, None),
+    }
+
+    #Recorre el archivo una sola vez, línea por línea: primero lee la configuración y después manda cada línea
+    #a la sección en la que está.
+    seccion = None
+    leidos = 0
+    cantidad = 0
+    leyendo_configuracion = True
+    try:
+        with open(nombre_archivo, 'r') as f:
+            for linea in f:
+                #Detecta el inicio de una parte de la configuracion, tiene que tener la forma ---XXXXX---
+                if "---" in linea:
+                    partes = linea.split("---")
+                    if len(partes) > 1:
+                        seccion = secciones.get(partes[1].strip().split()[0].upper())
+                        leidos = 0
+                        if seccion is not None:
+                            clave_cantidad = seccion[2]
+                            cantidad = datos['configuracion'][clave_cantidad] if clave_cantidad else float('inf')
+                        continue  # el encabezado no es un dato de la sección
+
+                linea = eliminar_comentario(linea)
+                if not linea:
+                    continue
+
+                if seccion is not None:
+                    if leidos >= cantidad:
+                        continue
+                    destino, parser, _ = seccion
+                    try:
+                        clave, valor = parser(linea)
+                    except Exception:
+                        print(f"Advertencia: no se pudo leer la línea -> {linea}")
+                        continue
+                    if destino == 'aristas':
+                        guardar_arista(clave, valor)
+                    else:
+                        datos[destino][clave] = valor
+                    leidos += 1
+                    continue
+
+                #Detecta cada parte del archivo casos y lo guarda en su respectivo diccionario.
+                if not leyendo_configuracion:
+                    continue
+                partes = linea.split()
+                if len(partes) < 2:
+                    continue
+                if partes[0] == "NODOS":
+                    datos['configuracion']['num_nodos'] = int(partes[1])
+                elif partes[0] == "HUBS":
+                    datos['configuracion']['num_hubs'] = int(partes[1])
+                elif partes[0] == "PAQUETES":
+                    datos['configuracion']['num_paquetes'] = int(partes[1])
+                elif partes[0] == "CAPACIDAD_CAMION":
+                    datos['configuracion']['capacidad_camion'] = int(partes[1])
+                elif partes[0] == "DEPOSITO_ID":
+                    datos['configuracion']['deposito_id'] = int(partes[1])
+                    leyendo_configuracion = False  # termina la lectura de configuración
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo '{nombre_archivo}'")
+        return None
 
     return datos
 
@@ -135,22 +143,119 @@ def leer_datos(nombre_archivo: str) -> dict:
 # ALGORITMO DE FLOYD-WARSHALL
 # ------------------------------------------------------------
 
-#Calcula las distancias mínimas entre todos los nodos del grafo. Devuelve la matriz de distancias mínimas
-def floyd_warshall(aristas, num_nodos):
-    dist = [[float('inf')] * num_nodos for _ in range(num_nodos)]
+#Núcleo de Floyd-Warshall compilado con numba: modifica la matriz en el lugar y reparte las filas i entre los núcleos.
+#Con k fijo no hay conflictos entre hilos, porque la fila k y la columna k no cambian en esa iteración.
+#fastmath sin 'ninf'/'nnan', ya que la matriz usa inf para los pares sin camino.
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+    def _floyd_warshall_numba(dist, n):
+        for k in range(n):
+            dk = dist[k]
+            for i in prange(n):
+                dik = dist[i, k]
+                if dik == np.inf:
+                    continue
+                di = dist[i]
+                for j in range(n):
+                    nd = dik + dk[j]
+                    if nd < di[j]:
+                        di[j] = nd
+
+
+#Versión en Python puro, para cuando NumPy no está instalado. Las filas k e i se guardan en variables locales
+#para no volver a indexar la matriz en el ciclo interno.
+def _floyd_warshall_python(aristas, num_nodos):
+    inf = float('inf')
+    dist = [[inf] * num_nodos for _ in range(num_nodos)]
     for i in range(num_nodos):
         dist[i][i] = 0
     for (u, v), peso in aristas.items():
-        dist[u][v] = peso
-        dist[v][u] = peso
+        dist[u][v] = dist[v][u] = peso
 
-    # Aplicar el algoritmo de Floyd-Warshall para calcular distancias mínimas
     for k in range(num_nodos):
+        dk = dist[k]
         for i in range(num_nodos):
+            di = dist[i]
+            dik = di[k]
+            if dik == inf:
+                continue
             for j in range(num_nodos):
-                if dist[i][j] > dist[i][k] + dist[k][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
+                nd = dik + dk[j]
+                if nd < di[j]:
+                    di[j] = nd
+
+    return dist
 
+
+#Calcula las distancias mínimas entre todos los nodos del grafo. Devuelve la matriz de distancias mínimas
+#(un ndarray de float64, o una lista de listas si NumPy no está instalado)
+def floyd_warshall(aristas, num_nodos):
+    if np is None:
+        return _floyd_warshall_python(aristas, num_nodos)
+
+    dist = np.full((num_nodos, num_nodos), np.inf, dtype=np.float64)
+    np.fill_diagonal(dist, 0.0)
+    # Las aristas se pasan a arreglos paralelos (extremos y pesos) y se cargan en la matriz de una sola vez.
+    # El diccionario ya no tiene claves repetidas, así que no importa el orden de escritura.
+    if aristas:
+        extremos = np.array(list(aristas), dtype=np.int64)
+        pesos = np.fromiter(aristas.values(), dtype=np.float64, count=len(aristas))
+        dist[extremos[:, 0], extremos[:, 1]] = pesos
+        dist[extremos[:, 1], extremos[:, 0]] = pesos
+
+    # Aplicar el algoritmo de Floyd-Warshall para calcular distancias mínimas.
+    if njit is not None:
+        _floyd_warshall_numba(dist, num_nodos)
+    else:
+        # Para cada k se relajan todos los pares (i, j) a la vez: la columna k más la fila k (broadcasting).
+        for k in range(num_nodos):
+            np.minimum(dist, dist[:, k:k + 1] + dist[k:k + 1, :], out=dist)
+
+    return dist
+
+
+#Versión del formato del cache de Floyd-Warshall. Hay que aumentarla cada vez que cambie lo que significa la matriz
+#guardada (cómo se leen las aristas, cómo se arma la matriz), para que no se use un cache de una versión anterior.
+VERSION_CACHE_FW = 1
+
+#Igual que floyd_warshall, pero guarda la matriz junto al archivo del caso ('<archivo>.fw.npz') y la reutiliza
+#en las siguientes ejecuciones mientras el archivo no cambie (misma fecha de modificación, tamaño y cantidad de
+#nodos) y el cache sea de la misma VERSION_CACHE_FW. Sin NumPy siempre se calcula.
+def floyd_warshall_con_cache(nombre_archivo, aristas, num_nodos):
+    if np is None:
+        return floyd_warshall(aristas, num_nodos)
+
+    info = os.stat(nombre_archivo)
+    clave = np.array([VERSION_CACHE_FW, info.st_mtime_ns, info.st_size, num_nodos], dtype=np.int64)
+    archivo_cache = nombre_archivo + ".fw.npz"
+
+    try:
+        with np.load(archivo_cache) as cache:
+            if np.array_equal(cache['clave'], clave):
+                return cache['dist']
+    except Exception:
+        pass  # no hay cache, está incompleto o no se pudo leer: se calcula de nuevo
+
+    dist = floyd_warshall(aristas, num_nodos)
+
+    #Se escribe en un archivo temporal de la misma carpeta y después se reemplaza el cache de una vez, así una
+    #ejecución interrumpida no deja un cache a medio escribir.
+    try:
+        f = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(archivo_cache)), suffix=".tmp",
+                                        delete=False)
+    except OSError:
+        print(f"Advertencia: no se pudo guardar '{archivo_cache}'")
+        return dist
+    try:
+        with f:
+            np.savez(f, clave=clave, dist=dist)
+        os.replace(f.name, archivo_cache)
+    except OSError:
+        print(f"Advertencia: no se pudo guardar '{archivo_cache}'")
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
     return dist
 
 
@@ -163,105 +268,185 @@ def floyd_warshall(aristas, num_nodos):
 def calcular_mejor_camino(datos, matriz):
     deposito = datos['configuracion']['deposito_id']
     capacidad = datos['configuracion']['capacidad_camion']
-    hubs = list(datos['hubs'].keys())
     costo_hubs = datos['hubs']
+    # Los hubs se deciden del más barato al más caro: así las combinaciones baratas se prueban primero y la poda
+    # corta antes las ramas caras. Los empates se siguen resolviendo por el orden del archivo (ver orden y
+    # registrar_si_mejora), igual que si los hubs se recorrieran en ese orden.
+    hubs = sorted(costo_hubs, key=costo_hubs.get)
+    orden = {deposito: -1}
+    for posicion, hub in enumerate(costo_hubs):
+        orden.setdefault(hub, posicion)
 
     # Agrupa los paquetes por destino
-    paquetes_por_destino = {}
-    for _, paquete in datos['paquetes'].items():
-        destino = paquete['destino']
-        paquetes_por_destino[destino] = paquetes_por_destino.get(destino, 0) + 1
+    paquetes_por_destino = Counter(paquete['destino'] for paquete in datos['paquetes'].values())
+
+    # Agrupar destinos respetando la capacidad del camión (no depende de los hubs elegidos)
+    destinos = list(paquetes_por_destino.keys())
+    viajes = []
+    viaje_actual = []
+    carga_actual = 0
+    for d in destinos:
+        cant = paquetes_por_destino[d]
+        if carga_actual + cant > capacidad:
+            viajes.append(viaje_actual)
+            viaje_actual = []
+            carga_actual = 0
+        viaje_actual.append(d)
+        carga_actual += cant
+    if viaje_actual:
+        viajes.append(viaje_actual)
+
+    # Solo el primer tramo de cada viaje depende del punto de salida (el depósito o un hub activo), así que por
+    # cada combinación alcanza con saber, para cada viaje, cuál es el punto de salida más cercano a su primer
+    # destino. Al activar un hub eso se actualiza a partir de la combinación anterior, comparando solo contra
+    # la fila del hub nuevo.
+    primeros = [viaje[0] for viaje in viajes]
+
+    # De la matriz solo hacen falta, para cada punto de salida posible (el depósito y los hubs), las distancias
+    # a los primeros destinos de los viajes. Se sacan una sola vez como floats, así el resto de la búsqueda
+    # trabaja con listas chicas sin importar si la matriz es un ndarray o una lista de listas.
+    primer_tramo = {p: [float(matriz[p][f]) for f in primeros] for p in [deposito] + hubs}
+    distancia_inicio_base = primer_tramo[deposito]
+    inicios_base = [deposito] * len(viajes)
+
+    # El resto de cada viaje (de un destino al siguiente y la vuelta al depósito) no depende de los hubs, así que
+    # se suma una sola vez: en cada combinación la distancia total es esto más los primeros tramos.
+    distancia_interior = 0.0
+    for viaje in viajes:
+        # Usar el orden de destinos sin heurística
+        for k in range(len(viaje) - 1):
+            distancia_interior += float(matriz[viaje[k]][viaje[k + 1]])
+        distancia_interior += float(matriz[viaje[-1]][deposito])
+
+    # Cota para la poda: cota_inicio[i][v] es el primer tramo más corto que puede lograr el viaje v con los hubs
+    # que quedan por decidir desde el índice i (hubs[i:]). Activar hubs solo acorta primeros tramos y los costos
+    # de activación no son negativos, así que ninguna combinación de la rama cuesta menos que
+    # costo_activacion + distancia_interior + suma de min(distancia_inicio[v], cota_inicio[i][v]).
+    cota_inicio = [[float('inf')] * len(viajes)]
+    for hub in reversed(hubs):
+        cota_inicio.append(list(map(min, cota_inicio[-1], primer_tramo[hub])))
+    cota_inicio.reverse()
+
+    def cota_distancia(indice, distancia_inicio):
+        return distancia_interior + sum(map(min, distancia_inicio, cota_inicio[indice]))
 
     # Variables globales del mejor resultado encontrado
     mejor_costo = float('inf')
+    mejor_clave = None  # qué hubs del archivo están activos, para desempatar (ver registrar_si_mejora)
     mejor_hubs = []
     mejor_ruta = []
     mejor_distancia = 0
 
-
+    # Devuelve el primer tramo y el punto de salida de cada viaje después de activar 'hub', y si el hub acorta
+    # algún viaje. Ante un empate gana el punto que va primero en [deposito] + hubs en el orden del archivo,
+    # igual que al recorrer [deposito] + hubs_activos en ese orden; un empate no cuenta como mejora.
+    def activar_hub(hub, distancia_inicio, inicios):
+        nueva_distancia = distancia_inicio[:]
+        nuevos_inicios = inicios[:]
+        mejora = False
+        for v, distancia in enumerate(primer_tramo[hub]):
+            if distancia < nueva_distancia[v]:
+                nueva_distancia[v] = distancia
+                nuevos_inicios[v] = hub
+                mejora = True
+            elif distancia == nueva_distancia[v] and orden[hub] < orden[nuevos_inicios[v]]:
+                nuevos_inicios[v] = hub
+        return nueva_distancia, nuevos_inicios, mejora
+
+    # Guarda la combinación si mejora el mejor costo encontrado. La ruta completa solo se arma en ese caso.
+    # Entre combinaciones del mismo costo se queda con la que aparecería primero recorriendo los hubs en el orden
+    # del archivo y probando primero sin activar cada uno: la de menor clave (False < True hub por hub).
+    def registrar_si_mejora(hubs_activos, costo_activacion, distancia_inicio, inicios):
+        nonlocal mejor_costo, mejor_clave, mejor_hubs, mejor_ruta, mejor_distancia
+
+        # Con todos los hubs decididos la cota es exacta; se usa la misma suma para que los empates coincidan
+        distancia_total = cota_distancia(len(hubs), distancia_inicio)
+        costo_total = distancia_total + costo_activacion
+
+        # Un costo infinito (algún destino inalcanzable) nunca se guarda, igual que antes: queda COSTO_TOTAL inf
+        if costo_total == float('inf') or costo_total > mejor_costo:
+            return
+        clave = [h in hubs_activos for h in costo_hubs]
+        if costo_total < mejor_costo or (mejor_clave is not None and clave < mejor_clave):
+            mejor_costo = costo_total
+            mejor_clave = clave
+            mejor_hubs = [h for h in costo_hubs if h in hubs_activos]  # en el orden del archivo
+            mejor_distancia = distancia_total
+
+            mejor_ruta = [deposito]
+            for punto_inicio, viaje in zip(inicios, viajes):
+                mejor_ruta.append(punto_inicio)
+                mejor_ruta.extend(viaje)
+                mejor_ruta.append(deposito)
+
+    # Solución voraz inicial: empezando sin hubs, activa en cada paso el hub que más baja el costo total, mientras
+    # alguno lo baje. Así el backtracking arranca con un mejor_costo ajustado y la cota poda desde el principio.
+    def solucion_voraz():
+        hubs_activos = []
+        costo_activacion = 0
+        distancia_inicio, inicios = distancia_inicio_base, inicios_base
+        costo_actual = distancia_interior + sum(distancia_inicio)
+        while True:
+            mejor_paso = None
+            for hub in hubs:
+                if hub in hubs_activos:
+                    continue
+                nueva_distancia, nuevos_inicios, mejora = activar_hub(hub, distancia_inicio, inicios)
+                if not mejora:
+                    continue
+                costo = distancia_interior + sum(nueva_distancia) + costo_activacion + costo_hubs[hub]
+                if costo < costo_actual:
+                    costo_actual = costo
+                    mejor_paso = (hub, nueva_distancia, nuevos_inicios)
+            if mejor_paso is None:
+                break
+            hub, distancia_inicio, inicios = mejor_paso
+            hubs_activos.append(hub)
+            costo_activacion += costo_hubs[hub]
+
+        # Un hub que activaron pasos posteriores puede haber quedado sin ningún viaje que salga de él: se saca,
+        # porque no cambia la distancia y solo suma costo (o empata, si su activación es gratis).
+        usados = set(inicios)
+        hubs_activos = [hub for hub in hubs_activos if hub in usados]
+        costo_activacion = sum(costo_hubs[hub] for hub in hubs_activos)
+
+        registrar_si_mejora(hubs_activos, costo_activacion, distancia_inicio, inicios)
 
     # ---------------------------------------------------------
     # Función recursiva de backtracking
     # ---------------------------------------------------------
-    def probar_combinaciones(indice, hubs_activos, costo_activacion):
-        nonlocal mejor_costo, mejor_hubs, mejor_ruta, mejor_distancia
-
-        # Poda: si el costo de activación ya supera el mejor costo total encontrado, no continuar
-        if costo_activacion >= mejor_costo:
+    def probar_combinaciones(indice, hubs_activos, costo_activacion, distancia_inicio, inicios):
+        # Poda: si ni activando todos los hubs que faltan se llega al mejor costo encontrado, no continuar.
+        # Un empate no se poda, porque puede ganar el desempate por orden del archivo.
+        if costo_activacion + cota_distancia(indice, distancia_inicio) > mejor_costo:
             return
 
         # Caso base: se decidió sobre todos los hubs
         if indice == len(hubs):
-            destinos = list(paquetes_por_destino.keys())
-            viajes = []
-            viaje_actual = []
-            carga_actual = 0
-
-            # Agrupar destinos respetando la capacidad del camión
-            for d in destinos:
-                cant = paquetes_por_destino[d]
-                if carga_actual + cant > capacidad:
-                    viajes.append(viaje_actual)
-                    viaje_actual = []
-                    carga_actual = 0
-                viaje_actual.append(d)
-                carga_actual += cant
-            if viaje_actual:
-                viajes.append(viaje_actual)
-
-            # Calcular distancia total
-            distancia_total = 0
-            ruta_total = [deposito]
-
-            for viaje in viajes:
-                # Usar el orden de destinos sin heurística
-                viaje_ordenado = viaje
-
-                mejor_inicio = deposito
-                menor_distancia_viaje = float('inf')
-
-                # Probar salir desde el depósito o un hub activo
-                for punto_inicio in [deposito] + hubs_activos:
-                    distancia_viaje = matriz[punto_inicio][viaje_ordenado[0]]
-                    for k in range(len(viaje_ordenado) - 1):
-                        distancia_viaje += matriz[viaje_ordenado[k]][viaje_ordenado[k + 1]]
-                    distancia_viaje += matriz[viaje_ordenado[-1]][deposito]
-
-                    if distancia_viaje < menor_distancia_viaje:
-                        menor_distancia_viaje = distancia_viaje
-                        mejor_inicio = punto_inicio
-
-                distancia_total += menor_distancia_viaje
-                ruta_total.append(mejor_inicio)
-                for d in viaje_ordenado:
-                    ruta_total.append(d)
-                ruta_total.append(deposito)
-
-            costo_total = distancia_total + costo_activacion
-
-            # Actualizar mejor combinación encontrada
-            if costo_total < mejor_costo:
-                mejor_costo = costo_total
-                mejor_hubs = hubs_activos[:]
-                mejor_ruta = ruta_total[:]
-                mejor_distancia = distancia_total
-
+            registrar_si_mejora(hubs_activos, costo_activacion, distancia_inicio, inicios)
             return  # Fin de la rama
 
         # ---------------------------------------------------------
         # Paso recursivo: decidir activar o no el hub actual
         # ---------------------------------------------------------
         # No activar el hub
-        probar_combinaciones(indice + 1, hubs_activos, costo_activacion)
+        probar_combinaciones(indice + 1, hubs_activos, costo_activacion, distancia_inicio, inicios)
 
-        # Activar el hub actual
+        # Activar el hub actual. Poda: si el hub no acorta ningún viaje, cada combinación de esta rama tiene la
+        # misma distancia que su par sin el hub (ya probado) y cuesta lo mismo o más, así que no puede mejorar
+        # ni ganarle un desempate.
         hub_actual = hubs[indice]
+        nueva_distancia, nuevos_inicios, mejora = activar_hub(hub_actual, distancia_inicio, inicios)
+        if not mejora:
+            return
         hubs_activos.append(hub_actual)
-        probar_combinaciones(indice + 1, hubs_activos, costo_activacion + costo_hubs[hub_actual])
+        probar_combinaciones(indice + 1, hubs_activos, costo_activacion + costo_hubs[hub_actual],
+                             nueva_distancia, nuevos_inicios)
         hubs_activos.pop()  # volver atrás (backtracking)
 
     # Llamada inicial
-    probar_combinaciones(0, [], 0)
+    solucion_voraz()
+    probar_combinaciones(0, [], 0, distancia_inicio_base, inicios_base)
 
     costo_solo_hubs = mejor_costo - mejor_distancia
     return mejor_ruta, mejor_hubs, mejor_costo, mejor_distancia, costo_solo_hubs
@@ -285,7 +470,7 @@ def main():
         sys.exit(1)
 
     num_nodos = datos['configuracion']['num_nodos']
-    matriz = floyd_warshall(datos['aristas'], num_nodos)
+    matriz = floyd_warshall_con_cache(archivo, datos['aristas'], num_nodos)
 
     ruta, hubs, costo_total, distancia, costo_hubs = calcular_mejor_camino(datos, matriz)
 
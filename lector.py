@@ -4,6 +4,11 @@ import sys
 from dataclasses import dataclass
 from typing import List, Optional
 
+try:
+    import numpy as np
+except ImportError:  # sin NumPy la matriz se guarda como lista de listas
+    np = None
+
 
 @dataclass
 class Nodo:
@@ -36,14 +41,12 @@ class Problema:
         self.nodos: List[Nodo] = []
         self.hubs: List[Hub] = []
         self.paquetes: List[Paquete] = []
-        self.grafo_distancias: List[List[float]] = []
+        self.grafo_distancias = []  # ndarray (n, n) de float64, o List[List[float]] sin NumPy
 
 
 def eliminar_comentario(linea: str) -> str:
     """Elimina comentarios de una línea."""
-    if "//" in linea:
-        return linea[:linea.index("//")].strip()
-    return linea.strip()
+    return linea.partition("//")[0].strip()
 
 
 def leer_archivo(nombre_archivo: str) -> Optional[Problema]:
@@ -81,8 +84,11 @@ def leer_archivo(nombre_archivo: str) -> Optional[Problema]:
         
         idx += 1
 
-    # Inicializar matriz de distancias
-    p.grafo_distancias = [[0.0 for _ in range(p.num_nodos)] for _ in range(p.num_nodos)]
+    # Inicializar matriz de distancias (contigua, 8 bytes por celda, si NumPy está disponible)
+    if np is not None:
+        p.grafo_distancias = np.zeros((p.num_nodos, p.num_nodos), dtype=np.float64)
+    else:
+        p.grafo_distancias = [[0.0 for _ in range(p.num_nodos)] for _ in range(p.num_nodos)]
 
     # --- ENCONTRAR Y LEER CADA SECCIÓN ---
     